@@ -23,10 +23,12 @@ import os
 import re
 import sys
 import argparse
+import heapq
 import shutil
-import subprocess
-import zipfile
+import tempfile
+import time
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Tuple
 
@@ -51,22 +53,49 @@ class Colors:
     BLUE = '\033[0;34m'
     NC = '\033[0m'  # No Color
 
+# Color only when the stream is a terminal; piped or redirected output stays plain
+_USE_COLOR = sys.stdout.isatty()
+_USE_COLOR_ERR = sys.stderr.isatty()
+
+# Prefixes, built once rather than formatted on every message
+_LOG_OPEN = f"{Colors.BLUE}[" if _USE_COLOR else "["
+_LOG_CLOSE = f"]{Colors.NC} " if _USE_COLOR else "] "
+_ERROR_PREFIX = f"{Colors.RED}ERROR:{Colors.NC} " if _USE_COLOR_ERR else "ERROR: "
+_SUCCESS_PREFIX = f"{Colors.GREEN}SUCCESS:{Colors.NC} " if _USE_COLOR else "SUCCESS: "
+_WARNING_PREFIX = f"{Colors.YELLOW}WARNING:{Colors.NC} " if _USE_COLOR else "WARNING: "
+
+# Last formatted log timestamp and the epoch second it was formatted for
+_log_stamp_second = None
+_log_stamp = ""
+
+def _format_log(message: str) -> str:
+    """Return a timestamped log line, reformatting the time at most once per second."""
+    global _log_stamp_second, _log_stamp
+    now = int(time.time())
+    if now != _log_stamp_second:
+        _log_stamp_second = now
+        _log_stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    return _LOG_OPEN + _log_stamp + _LOG_CLOSE + message + "\n"
+
 def log(message: str) -> None:
-    """Print a log message with timestamp and blue color."""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"{Colors.BLUE}[{timestamp}]{Colors.NC} {message}")
+    """Print a log message with timestamp (blue on a terminal)."""
+    sys.stdout.write(_format_log(message))
 
 def error(message: str) -> None:
-    """Print an error message with red color."""
-    print(f"{Colors.RED}ERROR:{Colors.NC} {message}", file=os.sys.stderr)
+    """Print an error message to stderr (red on a terminal)."""
+    sys.stderr.write(_ERROR_PREFIX + message + "\n")
 
 def success(message: str) -> None:
-    """Print a success message with green color."""
-    print(f"{Colors.GREEN}SUCCESS:{Colors.NC} {message}")
+    """Print a success message (green on a terminal)."""
+    sys.stdout.write(_SUCCESS_PREFIX + message + "\n")
 
 def warning(message: str) -> None:
-    """Print a warning message with yellow color."""
-    print(f"{Colors.YELLOW}WARNING:{Colors.NC} {message}")
+    """Print a warning message (yellow on a terminal)."""
+    sys.stdout.write(_WARNING_PREFIX + message + "\n")
+
+def _emit(lines) -> None:
+    """Print a block of lines with one write instead of one print() per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # =============================================================================
 # STEP 1: CORE UTILITIES
@@ -87,25 +116,53 @@ def get_utc_timestamp():
     return now.strftime("%Y-%m-%d %H:%M:%S UTC")
 
 
+# Presence of this file identifies the foundation repo root.
+FOUNDATION_MARKER_REL = os.path.join("library", "agent_foundation.json")
+
+# (cwd, root) from the last successful find_workspace_root() walk
+_workspace_root_cache: Optional[Tuple[str, Path]] = None
+
+
 def find_workspace_root() -> Path:
     """
     Find the Resonance7 foundation repo root (contains library/agent_foundation.json).
 
-    Searches upward from cwd and from this script's location.
-    """
-    starts = [Path.cwd().resolve(), Path(__file__).resolve().parent]
-    seen: set[Path] = set()
+    If R7_WORKSPACE_ROOT is set, that directory is used without walking.
+    Otherwise searches upward from cwd and from this script's location. The
+    result is cached per process and reused until the working directory changes.
+    """
+    global _workspace_root_cache
+    cwd = os.getcwd()
+    if _workspace_root_cache is not None and _workspace_root_cache[0] == cwd:
+        return _workspace_root_cache[1]
+
+    env_root = os.environ.get("R7_WORKSPACE_ROOT")
+    if env_root:
+        if not os.path.isfile(os.path.join(env_root, FOUNDATION_MARKER_REL)):
+            raise FileNotFoundError(
+                f"R7_WORKSPACE_ROOT={env_root} is not a Resonance7 workspace "
+                "(missing library/agent_foundation.json)."
+            )
+        root = Path(env_root).resolve()
+        _workspace_root_cache = (cwd, root)
+        return root
+
+    # Walk on plain strings; only the hit is wrapped in a Path.
+    starts = [os.path.realpath(cwd), os.path.dirname(os.path.realpath(__file__))]
+    seen: set[str] = set()
 
     for start in starts:
         current = start
-        while current != current.parent:
+        parent = os.path.dirname(current)
+        while current != parent:
             if current in seen:
                 break
             seen.add(current)
-            marker = current / "library" / "agent_foundation.json"
-            if marker.is_file():
-                return current
-            current = current.parent
+            if os.path.isfile(os.path.join(current, FOUNDATION_MARKER_REL)):
+                root = Path(current)
+                _workspace_root_cache = (cwd, root)
+                return root
+            current, parent = parent, os.path.dirname(parent)
 
     raise FileNotFoundError(
         "Could not find Resonance7 workspace root (library/agent_foundation.json). "
@@ -151,12 +208,13 @@ def workspace_root_from_sessions_dir(sessions_dir: Path) -> Path:
     return sessions_root.parent
 
 
-def get_session_files(sessions_dir):
+def get_session_files(sessions_dir, limit=None):
     """
     Get all session log files from the directory.
     
     Args:
         sessions_dir (Path): Path to sessions/current/
+        limit (int, optional): Return only the N most recent files
     
     Returns:
         list: List of Path objects for .md files, sorted by modification time
@@ -166,10 +224,26 @@ def get_session_files(sessions_dir):
         >>> [f.name for f in files]
         ['20251013-01.md', '20251012-03.md', ...]
     """
-    md_files = list(sessions_dir.glob("*.md"))
-    # Sort by modification time, newest first
-    md_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-    return md_files
+    # One directory read; DirEntry carries the name (and on Windows the stat)
+    # so no Path objects are built until the final list. normcase keeps the
+    # .md match case-insensitive on Windows, like glob.
+    with os.scandir(sessions_dir) as it:
+        entries = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in it
+            if os.path.normcase(entry.name).endswith(".md")
+        ]
+    # Sort by modification time, newest first (partial selection when only
+    # the top N are wanted; same order as a full sort then slice)
+    if limit is not None:
+        entries = heapq.nlargest(limit, entries, key=lambda e: e[0])
+    else:
+        entries.sort(key=lambda e: e[0], reverse=True)
+    return [Path(path) for _, path in entries]
+
+
+# Pattern: YYYYMMDD-NN.md or YYYYMMDD-NN_ptX.md
+_SESSION_FILENAME_RE = re.compile(r'(\d{8})-(\d{2})(?:_pt(\d+))?\.md$')
 
 
 def parse_session_filename(filename):
@@ -180,25 +254,25 @@ def parse_session_filename(filename):
         filename (str): Filename like "20251013-01.md" or "20251013-01_pt2.md"
     
     Returns:
-        dict or None: {'date': '20251013', 'number': '01', 'part': 'pt2'}
+        dict or None: {'date': '20251013', 'number': '01', 'part': 'pt2', 'part_num': 2}
                       or None if filename doesn't match pattern
     
     Examples:
         >>> parse_session_filename("20251013-01.md")
-        {'date': '20251013', 'number': '01', 'part': None}
+        {'date': '20251013', 'number': '01', 'part': None, 'part_num': None}
         
         >>> parse_session_filename("20251013-01_pt2.md")
-        {'date': '20251013', 'number': '01', 'part': 'pt2'}
+        {'date': '20251013', 'number': '01', 'part': 'pt2', 'part_num': 2}
     """
-    # Pattern: YYYYMMDD-NN.md or YYYYMMDD-NN_ptX.md
-    pattern = r'(\d{8})-(\d{2})(?:_pt(\d+))?\.md$'
-    match = re.match(pattern, filename)
+    match = _SESSION_FILENAME_RE.match(filename)
     
     if match:
+        part_digits = match.group(3)
         return {
             'date': match.group(1),
             'number': match.group(2),
-            'part': f"pt{match.group(3)}" if match.group(3) else None
+            'part': f"pt{part_digits}" if part_digits else None,
+            'part_num': int(part_digits) if part_digits else None
         }
     return None
 
@@ -227,15 +301,16 @@ def calculate_next_session_number(sessions_dir):
     """
     today = datetime.now(timezone.utc).strftime("%Y%m%d")
     
-    # Get all session files
-    files = get_session_files(sessions_dir)
-    
-    # Find sessions from today
+    # Find sessions from today: a cheap prefix check skips older history
+    # without stat'ing or sorting the whole directory
     today_sessions = []
-    for file in files:
-        parsed = parse_session_filename(file.name)
-        if parsed and parsed['date'] == today:
-            today_sessions.append(int(parsed['number']))
+    with os.scandir(sessions_dir) as it:
+        for entry in it:
+            if not entry.name.startswith(today):
+                continue
+            parsed = parse_session_filename(entry.name)
+            if parsed:
+                today_sessions.append(int(parsed['number']))
     
     # Calculate next number
     if today_sessions:
@@ -263,12 +338,13 @@ def get_last_session_info(sessions_dir):
         >>> info['filename']
         '20251013-01.md'
     """
-    files = get_session_files(sessions_dir)
+    # Only the newest file is needed, so skip sorting the rest
+    files = get_session_files(sessions_dir, limit=1)
     
     if not files:
         return None
     
-    last_file = files[0]  # Already sorted by modification time
+    last_file = files[0]
     parsed = parse_session_filename(last_file.name)
     
     if parsed:
@@ -286,6 +362,56 @@ def get_last_session_info(sessions_dir):
 # STEP 2: YAML FRONTMATTER HANDLING
 # =============================================================================
 
+def _read_frontmatter_block(lines):
+    """
+    Consume the frontmatter from an iterator of lines.
+
+    Returns the raw lines between the opening and closing '---' markers, or
+    None if the first line is not a marker or no closing marker follows. Lines
+    after the closing marker are left unconsumed for the caller.
+    """
+    first = next(lines, None)
+    if first is None or first.rstrip() != '---':
+        return None
+    block = []
+    for line in lines:
+        if line.rstrip() == '---':
+            return block
+        block.append(line)
+    return None
+
+
+def _parse_frontmatter_lines(block):
+    """Parse simple "key: value" lines from a frontmatter block into a dict."""
+    metadata = {}
+    for line in block:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        
+        # Split on first colon
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = key.strip()
+        value = value.strip()
+        
+        # Remove quotes from value if present
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        elif value.startswith("'") and value.endswith("'"):
+            value = value[1:-1]
+        
+        metadata[key] = value
+    return metadata
+
+
+def _strip_leading_blank_lines(text):
+    """Drop whitespace-only lines at the start of text (keeps indentation of the first real line)."""
+    stripped = text.lstrip()
+    return text[text.rfind('\n', 0, len(text) - len(stripped)) + 1:]
+
+
 def parse_yaml_frontmatter(file_path):
     """
     Parse YAML frontmatter from a markdown file.
@@ -311,44 +437,37 @@ def parse_yaml_frontmatter(file_path):
         Returns:
         {'title': 'Session 20251013-01', 'author': 'Resonance 7 Agent'}
     """
+    # Find YAML frontmatter between --- markers, streaming from the file and
+    # stopping at the closing marker; the session body is never read
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            block = _read_frontmatter_block(f)
     except Exception as e:
         print(f"Warning: Could not read {file_path}: {e}")
         return {}
     
-    # Find YAML frontmatter between --- markers
-    pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(pattern, content, re.DOTALL)
-    
-    if not match:
+    if block is None:
         return {}
     
-    yaml_content = match.group(1)
-    metadata = {}
-    
-    # Parse each line as "key: value"
-    for line in yaml_content.split('\n'):
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        
-        # Split on first colon
-        if ':' in line:
-            key, value = line.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-            
-            # Remove quotes from value if present
-            if value.startswith('"') and value.endswith('"'):
-                value = value[1:-1]
-            elif value.startswith("'") and value.endswith("'"):
-                value = value[1:-1]
-            
-            metadata[key] = value
-    
-    return metadata
+    return _parse_frontmatter_lines(block)
+
+
+# Field order to match session template
+_FRONTMATTER_FIELD_ORDER = (
+    'title', 'author', 'model', 'created', 'last_updated',
+    'status', 'category', 'description', 'previous_part', 'next_part'
+)
+
+# Characters that force a frontmatter value to be double-quoted
+_YAML_QUOTE_CHARS = frozenset(':#[]{} ')
+
+
+def _format_yaml_line(key, value):
+    """Render one "key: value" frontmatter line, quoting values with special characters or spaces."""
+    text = str(value)
+    if _YAML_QUOTE_CHARS.isdisjoint(text):
+        return f'{key}: {text}'
+    return f'{key}: "{text}"'
 
 
 def generate_yaml_frontmatter(metadata):
@@ -371,81 +490,146 @@ def generate_yaml_frontmatter(metadata):
     """
     lines = ['---']
     
-    # Define field order to match session template
-    field_order = [
-        'title', 'author', 'model', 'created', 'last_updated',
-        'status', 'category', 'description', 'previous_part', 'next_part'
-    ]
-    
     # Add fields in order
-    for key in field_order:
+    for key in _FRONTMATTER_FIELD_ORDER:
         if key in metadata:
-            value = metadata[key]
-            # Quote the value if it contains special characters or spaces
-            if any(char in str(value) for char in [':', '#', '[', ']', '{', '}']) or ' ' in str(value):
-                lines.append(f'{key}: "{value}"')
-            else:
-                lines.append(f'{key}: {value}')
+            lines.append(_format_yaml_line(key, metadata[key]))
     
     # Add any remaining fields not in the standard order
     for key, value in metadata.items():
-        if key not in field_order:
-            if any(char in str(value) for char in [':', '#', '[', ']', '{', '}']) or ' ' in str(value):
-                lines.append(f'{key}: "{value}"')
-            else:
-                lines.append(f'{key}: {value}')
+        if key not in _FRONTMATTER_FIELD_ORDER:
+            lines.append(_format_yaml_line(key, value))
     
     lines.append('---')
     return '\n'.join(lines)
 
 
-def update_yaml_field(file_path, field_name, new_value):
+def _atomic_write_text(file_path, content, target=None):
+    """
+    Replace file_path with content via a sibling temp file and os.replace().
+
+    A crash mid-write leaves the original file intact instead of truncated.
+    The original file's permission bits are carried over. With target, the
+    new content lands there instead and file_path itself is left in place;
+    an existing target is never overwritten (FileExistsError).
+    """
+    file_path = Path(file_path)
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with open(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(file_path, tmp_name)
+        if target is None:
+            os.replace(tmp_name, file_path)
+        else:
+            _publish_new_file(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _publish_new_file(tmp_name, target):
+    """
+    Move tmp_name to target, refusing to overwrite a target that exists.
+    
+    os.link() fails if target exists, where os.replace() would clobber it
+    silently. Filesystems without hard links fall back to a last-moment
+    existence check before os.replace().
+    """
+    try:
+        os.link(tmp_name, target)
+    except FileExistsError:
+        raise
+    except (AttributeError, OSError):
+        if os.path.exists(target):
+            raise FileExistsError(f"{Path(target).name} already exists")
+        os.replace(tmp_name, target)
+    else:
+        os.unlink(tmp_name)
+
+
+def _fsync_directory(dir_path):
+    """
+    Flush a directory entry change (rename, create) to disk.
+    
+    Best-effort durability hint: no-op where directories can't be opened
+    for fsync (Windows), and errors from filesystems that refuse it
+    (e.g. EINVAL) are ignored since the change itself already happened.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def update_yaml_fields(file_path, updates, rename_to=None):
     """
-    Update a specific field in a session's YAML frontmatter.
+    Update several fields in a session's YAML frontmatter at once.
     
     Args:
         file_path (Path): Path to session file
-        field_name (str): Name of field to update (e.g., 'next_part')
-        new_value (str): New value for the field
+        updates (dict): Field names mapped to their new values
+        rename_to (Path, optional): Write the updated file here and remove
+            file_path, renaming it in the same step (never overwrites an
+            existing file there). On failure only file_path is left.
     
     Returns:
         bool: True if successful, False otherwise
     
     Logic:
-        1. Read file content
+        1. Read frontmatter, then the rest of the file, in one pass
         2. Parse existing frontmatter
-        3. Update the field
+        3. Apply all updates
         4. Regenerate frontmatter
-        5. Write back to file
-    
-    Used for:
-        Adding 'next_part' field when creating continuations
+        5. Write back to file (or its new name) once
     """
     try:
-        # Read current content
+        # Read frontmatter and body in one pass over the file
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Parse frontmatter
-        metadata = parse_yaml_frontmatter(file_path)
+            block = _read_frontmatter_block(f)
+            rest = f.read() if block is not None else ''
+        metadata = _parse_frontmatter_lines(block) if block is not None else {}
         
         if not metadata:
             print(f"Warning: No frontmatter found in {file_path}")
             return False
         
-        # Update field
-        metadata[field_name] = new_value
+        # Update fields
+        metadata.update(updates)
         
         # Generate new frontmatter
         new_frontmatter = generate_yaml_frontmatter(metadata)
         
-        # Replace old frontmatter with new
-        pattern = r'^---\s*\n.*?\n---\s*\n'
-        new_content = re.sub(pattern, new_frontmatter + '\n\n', content, count=1, flags=re.DOTALL)
+        # Replace old frontmatter with new; blank lines after the closing
+        # marker collapse into the single separator below
+        body = _strip_leading_blank_lines(rest)
+        new_content = new_frontmatter + '\n\n' + body
         
-        # Write back
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        # Write back atomically
+        _atomic_write_text(file_path, new_content, rename_to)
+        
+        if rename_to is not None:
+            try:
+                os.unlink(file_path)
+            except OSError:
+                # Original still in place (e.g. held open on Windows): drop the
+                # new copy so a failure leaves exactly the original file
+                os.unlink(rename_to)
+                raise
+            _fsync_directory(rename_to.parent)
         
         return True
         
@@ -458,28 +642,9 @@ def update_yaml_field(file_path, field_name, new_value):
 # STEP 3: TEMPLATE BODY GENERATION
 # =============================================================================
 
-def generate_template_body(session_id, topic):
-    """
-    Generate the session log template body.
-    
-    Args:
-        session_id (str): Session ID like "20251014-01"
-        topic (str): Session topic/title
-    
-    Returns:
-        str: Complete template body with placeholders
-    
-    Logic:
-        Hardcoded template (kept in sync with library/templates/session_template.md)
-        Replaces YYYYMMDD-NN with actual session ID
-        Replaces [Topic/Project] with actual topic
-    
-    Note:
-        This is the complete template structure that agents fill in.
-        Kept in sync with library/templates/session_template.md
-    """
-    template = f"""# Session {session_id}: {topic}
-
+# Everything below the title line of library/templates/session_template.md.
+# Static, so it is built once at import and only the heading is formatted per call.
+_SESSION_TEMPLATE_BODY = """
 ## Summary
 [Main accomplishments, decisions, and key insights from this session]
 
@@ -543,10 +708,32 @@ def generate_template_body(session_id, topic):
 #### **Ready State**
 - [What's ready for use, what needs work]
 """
-    return template
 
 
-def create_session_file(file_path, metadata, session_id, topic):
+def generate_template_body(session_id, topic):
+    """
+    Generate the session log template body.
+    
+    Args:
+        session_id (str): Session ID like "20251014-01"
+        topic (str): Session topic/title
+    
+    Returns:
+        str: Complete template body with placeholders
+    
+    Logic:
+        Hardcoded template (kept in sync with library/templates/session_template.md)
+        Replaces YYYYMMDD-NN with actual session ID
+        Replaces [Topic/Project] with actual topic
+    
+    Note:
+        This is the complete template structure that agents fill in.
+        Kept in sync with library/templates/session_template.md
+    """
+    return f"# Session {session_id}: {topic}\n" + _SESSION_TEMPLATE_BODY
+
+
+def create_session_file(file_path, metadata, session_id, topic, frontmatter=None):
     """
     Create a complete session log file.
     
@@ -555,6 +742,8 @@ def create_session_file(file_path, metadata, session_id, topic):
         metadata (dict): Metadata fields for frontmatter
         session_id (str): Session ID like "20251014-01"
         topic (str): Session topic/title
+        frontmatter (str, optional): Already-rendered frontmatter for
+            metadata (e.g. from a preview); generated when omitted
     
     Returns:
         bool: True if successful, False otherwise
@@ -575,7 +764,8 @@ def create_session_file(file_path, metadata, session_id, topic):
     """
     try:
         # Generate components
-        frontmatter = generate_yaml_frontmatter(metadata)
+        if frontmatter is None:
+            frontmatter = generate_yaml_frontmatter(metadata)
         body = generate_template_body(session_id, topic)
         
         # Combine with blank line separator
@@ -596,6 +786,29 @@ def create_session_file(file_path, metadata, session_id, topic):
 # STEP 4: INTERACTIVE USER INTERFACE
 # =============================================================================
 
+# Separators and static screens, built once at import
+_SEP_EQ = "=" * 64
+_SEP_DASH = "-" * 64
+
+_HEADER_BANNER = f"{_SEP_EQ}\n  Resonance 7 - Session Log Creator\n{_SEP_EQ}\n"
+
+_SESSION_TYPE_MENU = "\n".join([
+    _SEP_DASH,
+    "  SESSION TYPE",
+    _SEP_DASH,
+    "",
+    "What would you like to do?",
+    "",
+    "1. New session (interactive)",
+    "2. Auto create (all defaults)",
+    "3. Continue existing session",
+    "4. Prune sessions",
+    "5. Ingest session logs to database",
+    "6. Cancel",
+    "",
+]) + "\n"
+
+
 def show_header(sessions_dir, next_session_id):
     """
     Display the Resonance7 header with context info.
@@ -610,24 +823,20 @@ def show_header(sessions_dir, next_session_id):
         - Last session info
         - Next session ID
     """
-    print("=" * 64)
-    print("  Resonance 7 - Session Log Creator")
-    print("=" * 64)
-    print()
-    
     # Show current time
     current_time = get_utc_timestamp()
-    print(f"Current UTC: {current_time}")
     
     # Show last session
     last_session = get_last_session_info(sessions_dir)
-    if last_session:
-        print(f"Last Session: {last_session['filename']}")
-    else:
-        print(f"Last Session: None")
+    last_name = last_session['filename'] if last_session else "None"
     
-    print(f"Next Session: {next_session_id}.md")
-    print()
+    _emit([
+        _HEADER_BANNER,
+        f"Current UTC: {current_time}",
+        f"Last Session: {last_name}",
+        f"Next Session: {next_session_id}.md",
+        "",
+    ])
 
 
 def show_session_type_menu():
@@ -645,25 +854,114 @@ def show_session_type_menu():
         5. Ingest session logs to database
         6. Cancel
     """
-    print("-" * 64)
-    print("  SESSION TYPE")
-    print("-" * 64)
-    print()
-    print("What would you like to do?")
-    print()
-    print("1. New session (interactive)")
-    print("2. Auto create (all defaults)")
-    print("3. Continue existing session")
-    print("4. Prune sessions")
-    print("5. Ingest session logs to database")
-    print("6. Cancel")
-    print()
+    sys.stdout.write(_SESSION_TYPE_MENU)
+    
+    return _prompt_menu_choice(
+        "Choice [1-6]: ", _SESSION_TYPE_CHOICES,
+        "Invalid choice. Please enter 1, 2, 3, 4, 5, or 6."
+    )
+
+
+# Accepted answers for yes/no prompts (input is lowercased first)
+_YES_ANSWERS = frozenset({'y', 'yes'})
+_NO_ANSWERS = frozenset({'n', 'no'})
+
+# Exact answers accepted by the numbered menus
+_SESSION_TYPE_CHOICES = frozenset({'1', '2', '3', '4', '5', '6'})
+_PRUNING_CHOICES = frozenset({'1', '2', '3', '4', '5'})
+
+
+def _discard_pending_input():
+    """
+    Throw away console input typed or pasted ahead of the current prompt.
+    
+    Returns:
+        bool: True if anything was waiting and got discarded
+    
+    Only acts on an interactive terminal; piped or redirected stdin is left
+    alone so scripted answers keep working.
+    """
+    if not sys.stdin.isatty():
+        return False
+    
+    if os.name == 'nt':
+        import msvcrt
+        discarded = False
+        while msvcrt.kbhit():
+            msvcrt.getwch()
+            discarded = True
+        return discarded
+    
+    import select
+    import termios
+    pending, _, _ = select.select([sys.stdin], [], [], 0)
+    if not pending:
+        return False
+    termios.tcflush(sys.stdin, termios.TCIFLUSH)
+    return True
+
+
+def _prompt_line(prompt):
+    """
+    Read one free-text line, dropping any extra lines that came with it.
     
+    A multi-line paste would otherwise spill its remaining lines into the
+    following prompts as if the user had answered them. Anything typed ahead
+    for the next prompt (e.g. the "Proceed?" confirmation) is discarded too,
+    since it can't be told apart from pasted text.
+    """
+    text = input(prompt).strip()
+    if _discard_pending_input():
+        warning("Only the first line was kept; extra pasted lines were discarded")
+    return text
+
+
+def _prompt_menu_choice(prompt, choices, invalid_msg):
+    """
+    Prompt until the user enters one of a menu's exact choice strings.
+    
+    Args:
+        prompt (str): Prompt passed to input()
+        choices (frozenset): Accepted answers, e.g. {'1', '2', '3'}
+        invalid_msg (str): Message printed for anything else
+    
+    Returns:
+        int: The chosen menu number
+    """
     while True:
-        choice = input("Choice [1-6]: ").strip()
-        if choice in ['1', '2', '3', '4', '5', '6']:
+        choice = input(prompt).strip()
+        if choice in choices:
             return int(choice)
-        print("Invalid choice. Please enter 1, 2, 3, 4, 5, or 6.")
+        print(invalid_msg)
+
+
+def _prompt_int_in_range(prompt, lo, hi, default=None):
+    """
+    Prompt until the user enters an integer in [lo, hi].
+    
+    Args:
+        prompt (str): Prompt passed to input()
+        lo, hi (int): Inclusive bounds
+        default (int, optional): Returned when the user just presses Enter
+    
+    Returns:
+        int: The chosen number
+    """
+    while True:
+        user_input = input(prompt).strip()
+        
+        if not user_input and default:
+            return default
+        
+        try:
+            choice_num = int(user_input)
+        except ValueError:
+            print("Please enter a valid number.")
+            continue
+        
+        if lo <= choice_num <= hi:
+            return choice_num
+        print(f"Please enter a number between {lo} and {hi}.")
 
 
 def prompt_with_default(prompt_text, default_value=None, allow_empty=False):
@@ -731,9 +1029,9 @@ def prompt_yes_no(prompt_text, default_yes=True):
         if not response:
             return default_yes
         
-        if response in ['y', 'yes']:
+        if response in _YES_ANSWERS:
             return True
-        elif response in ['n', 'no']:
+        elif response in _NO_ANSWERS:
             return False
         else:
             print("Please enter 'y' or 'n'.")
@@ -755,39 +1053,27 @@ def prompt_choice(prompt_text, choices, default=None):
         >>> prompt_choice("Status", ["Active", "Handoff", "Completed"], "Active")
         Status [1=Active, 2=Handoff, 3=Completed] [1]: 
     """
-    print()
-    print(prompt_text)
+    # Note the default's position while listing instead of scanning again
+    lines = ["", prompt_text]
+    default_index = None
     for i, choice in enumerate(choices, 1):
-        default_marker = " (default)" if default and choice == default else ""
-        print(f"{i}. {choice}{default_marker}")
-    print()
+        if default and choice == default:
+            lines.append(f"{i}. {choice} (default)")
+            if default_index is None:
+                default_index = i
+        else:
+            lines.append(f"{i}. {choice}")
+    lines.append("")
+    _emit(lines)
     
-    # Find default index
-    default_index = None
-    if default and default in choices:
-        default_index = choices.index(default) + 1
+    if default_index:
+        prompt = f"Choice [1-{len(choices)}, default={default_index}]: "
+    else:
+        prompt = f"Choice [1-{len(choices)}]: "
     
-    while True:
-        if default_index:
-            prompt = f"Choice [1-{len(choices)}, default={default_index}]: "
-        else:
-            prompt = f"Choice [1-{len(choices)}]: "
-        
-        user_input = input(prompt).strip()
-        
-        # User pressed Enter
-        if not user_input and default_index:
-            return default
-        
-        # Validate choice
-        try:
-            choice_num = int(user_input)
-            if 1 <= choice_num <= len(choices):
-                return choices[choice_num - 1]
-            else:
-                print(f"Please enter a number between 1 and {len(choices)}.")
-        except ValueError:
-            print("Please enter a valid number.")
+    # Enter selects the default (if any)
+    choice_num = _prompt_int_in_range(prompt, 1, len(choices), default=default_index)
+    return choices[choice_num - 1]
 
 
 def show_section_header(title):
@@ -802,11 +1088,24 @@ def show_section_header(title):
           TITLE
         -----------------------------------------------------------------
     """
-    print()
-    print("-" * 64)
-    print(f"  {title.upper()}")
-    print("-" * 64)
-    print()
+    _emit(["", _SEP_DASH, f"  {title.upper()}", _SEP_DASH, ""])
+
+
+# Fields shown on the confirmation screen, paired with their display labels
+_CONFIRM_FIELD_LABELS = tuple(
+    (field, field.replace('_', ' ').title())
+    for field in (
+        'title', 'author', 'model', 'created', 'last_updated',
+        'status', 'category', 'description'
+    )
+)
+
+
+def _truncate(value, width):
+    """Shorten value to width characters, marking the cut with '...'."""
+    if len(value) > width:
+        return value[:width - 3] + "..."
+    return value
 
 
 def confirm_metadata(metadata, session_id):
@@ -822,25 +1121,15 @@ def confirm_metadata(metadata, session_id):
     """
     show_section_header("Confirmation")
     
-    print(f"Creating: sessions/current/{session_id}.md")
-    print()
-    print("Metadata:")
-    
-    # Display in order
-    field_order = [
-        'title', 'author', 'model', 'created', 'last_updated',
-        'status', 'category', 'description'
-    ]
-    
-    for field in field_order:
-        if field in metadata:
-            # Truncate long values
-            value = str(metadata[field])
-            if len(value) > 60:
-                value = value[:57] + "..."
-            print(f"  {field.replace('_', ' ').title()}: {value}")
+    lines = [f"Creating: sessions/current/{session_id}.md", "", "Metadata:"]
+    lines.extend(
+        f"  {label}: {_truncate(str(metadata[field]), 60)}"
+        for field, label in _CONFIRM_FIELD_LABELS
+        if field in metadata
+    )
+    lines.append("")
+    _emit(lines)
     
-    print()
     return prompt_yes_no("Proceed?", default_yes=True)
 
 
@@ -853,13 +1142,15 @@ def show_success(session_path):
     """
     show_section_header("Session Created")
     
-    print(f"✅ Created: {session_path}")
-    print()
-    print("The session file includes:")
-    print("  - Complete YAML frontmatter")
-    print("  - Full template structure with placeholder sections")
-    print("  - Ready for agent to populate")
-    print()
+    _emit([
+        f"✅ Created: {session_path}",
+        "",
+        "The session file includes:",
+        "  - Complete YAML frontmatter",
+        "  - Full template structure with placeholder sections",
+        "  - Ready for agent to populate",
+        "",
+    ])
 
 
 # =============================================================================
@@ -893,7 +1184,7 @@ def collect_new_session_metadata(session_id):
     print("Enter session topic/title:")
     print("Press Enter to use placeholder for agent to name based on context.")
     print()
-    topic = input("> ").strip()
+    topic = _prompt_line("> ")
     
     if not topic:
         metadata['title'] = f"Session {session_id}: [Topic/Project]"
@@ -934,7 +1225,7 @@ def collect_new_session_metadata(session_id):
     print("Enter brief description (what this session accomplishes):")
     print("Press Enter to use placeholder for agent to fill in later.")
     print()
-    description = input("> ").strip()
+    description = _prompt_line("> ")
     
     if not description:
         metadata['description'] = "[Brief description of session focus]"
@@ -1065,7 +1356,8 @@ def create_auto_session_workflow(sessions_dir, dry_run=False):
         print("Complete YAML frontmatter preview:")
         print()
         
-        # Generate and display the actual frontmatter
+        # Generate and display the actual frontmatter; the same string is
+        # written to the file below
         frontmatter = generate_yaml_frontmatter(metadata)
         print(frontmatter)
         print()
@@ -1085,7 +1377,7 @@ def create_auto_session_workflow(sessions_dir, dry_run=False):
         # Create the file
         file_path = sessions_dir / f"{session_id}.md"
         
-        success = create_session_file(file_path, metadata, session_id, topic)
+        success = create_session_file(file_path, metadata, session_id, topic, frontmatter)
         
         if success:
             show_success(file_path)
@@ -1116,26 +1408,33 @@ def select_session_to_continue(sessions_dir):
         sessions_dir (Path): Path to sessions/current/
     
     Returns:
-        tuple: (session_path, parsed_info) or (None, None) if cancelled
+        tuple: (session_path, parsed_info, metadata) or (None, None, None)
+               if cancelled
     
     Shows recent sessions and lets user pick one or enter path manually.
     """
     show_section_header("Select Session to Continue")
     
     # Get recent sessions (limit to 10)
-    files = get_session_files(sessions_dir)[:10]
+    files = get_session_files(sessions_dir, limit=10)
     
     if not files:
         print("No sessions found in current/")
-        return None, None
+        return None, None, None
+    
+    # Parse each listed file's name and frontmatter once; the selection below
+    # reuses these results instead of parsing again
+    entries = []
+    for file_path in files:
+        parsed = parse_session_filename(file_path.name)
+        metadata = parse_yaml_frontmatter(file_path) if parsed else None
+        entries.append((file_path, parsed, metadata))
     
     print("Recent sessions in current/:")
     print()
-    for i, file_path in enumerate(files, 1):
-        parsed = parse_session_filename(file_path.name)
+    for i, (file_path, parsed, metadata) in enumerate(entries, 1):
         if parsed:
             # Get title from metadata if possible
-            metadata = parse_yaml_frontmatter(file_path)
             title = metadata.get('title', file_path.name)
             # Truncate long titles
             if len(title) > 50:
@@ -1157,9 +1456,10 @@ def select_session_to_continue(sessions_dir):
             
             # Selected a session from the list
             if 1 <= choice_num <= len(files):
-                selected_file = files[choice_num - 1]
-                parsed = parse_session_filename(selected_file.name)
-                return selected_file, parsed
+                selected_file, parsed, metadata = entries[choice_num - 1]
+                if metadata is None:
+                    metadata = parse_yaml_frontmatter(selected_file)
+                return selected_file, parsed, metadata
             
             # Manual entry
             elif choice_num == len(files) + 1:
@@ -1169,11 +1469,11 @@ def select_session_to_continue(sessions_dir):
                     print(f"File not found: {filename}")
                     continue
                 parsed = parse_session_filename(filename)
-                return file_path, parsed
+                return file_path, parsed, parse_yaml_frontmatter(file_path)
             
             # Cancel
             elif choice_num == len(files) + 2:
-                return None, None
+                return None, None, None
             
             else:
                 print(f"Please enter a number between 1 and {len(files) + 2}")
@@ -1197,42 +1497,52 @@ def determine_next_part_number(session_path, parsed_info):
         If file is "20251014-01.md" -> next is part 2
         If file is "20251014-01_pt2.md" -> next is part 3
     """
-    if parsed_info['part']:
+    if parsed_info['part_num'] is not None:
         # Already a part (e.g., pt2), increment
-        part_num = int(parsed_info['part'][2:])  # Extract number from "pt2"
-        return part_num + 1
+        return parsed_info['part_num'] + 1
     else:
         # Original file, next is part 2
         return 2
 
 
-def rename_to_part1(session_path, parsed_info):
+def get_part1_path(session_path, parsed_info):
     """
-    Rename a session file to add _pt1 suffix.
+    Work out the _pt1 name a session file takes when it gets a continuation.
     
     Args:
         session_path (Path): Current path (e.g., "20251014-01.md")
         parsed_info (dict): Parsed filename info
     
     Returns:
-        Path: New path (e.g., "20251014-01_pt1.md")
+        Path or None: New path (e.g., "20251014-01_pt1.md"), or None if the
+                      file already has a part number and keeps its name
     
-    Only renames if file doesn't already have a part number.
+    Raises:
+        FileExistsError: If the _pt1 file already exists
+    
+    Nothing is renamed here; update_yaml_fields moves the file to this path
+    in the same write that adds its next_part field.
     """
     if parsed_info['part']:
         # Already has part number, no rename needed
-        return session_path
+        return None
     
     # Generate new filename with _pt1
     new_name = f"{parsed_info['date']}-{parsed_info['number']}_pt1.md"
     new_path = session_path.parent / new_name
     
-    # Rename the file
-    session_path.rename(new_path)
+    # Never clobber an existing part 1 (os.replace would overwrite it)
+    if new_path.exists():
+        raise FileExistsError(f"{new_name} already exists")
     
     return new_path
 
 
+# Topic part of a session title: everything after the first ": ", minus any
+# leading "Part X: " prefix
+_TITLE_TOPIC_RE = re.compile(r'.*?: (?:Part .*?: )?(.*)', re.DOTALL)
+
+
 def collect_continuation_metadata(session_id, previous_metadata):
     """
     Collect metadata for a continuation session.
@@ -1263,19 +1573,15 @@ def collect_continuation_metadata(session_id, previous_metadata):
     print("Press Enter to keep the original title.")
     print()
     
-    new_subtitle = input("> ").strip()
+    new_subtitle = _prompt_line("> ")
     
     if new_subtitle:
         metadata['title'] = f"Session {session_id}: {new_subtitle}"
     else:
         # Extract original topic from previous title
-        prev_title = previous_metadata.get('title', '')
-        if ': ' in prev_title:
-            topic = prev_title.split(': ', 1)[1]
-            # Remove any "Part X: " prefix from the topic
-            if topic.startswith('Part ') and ': ' in topic:
-                topic = topic.split(': ', 1)[1]
-            metadata['title'] = f"Session {session_id}: {topic}"
+        match = _TITLE_TOPIC_RE.match(previous_metadata.get('title', ''))
+        if match:
+            metadata['title'] = f"Session {session_id}: {match.group(1)}"
         else:
             metadata['title'] = f"Session {session_id}"
     
@@ -1290,7 +1596,7 @@ def collect_continuation_metadata(session_id, previous_metadata):
     print("Press Enter to use placeholder for agent to fill in later.")
     print()
     
-    description = input("> ").strip()
+    description = _prompt_line("> ")
     
     if not description:
         metadata['description'] = "[Brief description of session focus]"
@@ -1323,25 +1629,22 @@ def create_continuation_workflow(sessions_dir, dry_run=False):
     Workflow:
         1. User selects session to continue
         2. Check if it already has a continuation (error if so)
-        3. Determine next part number
-        4. Rename original to _pt1 (if needed)
-        5. Collect metadata for new part
-        6. Update previous part with next_part field
-        7. Update previous part status to "Completed" if Active/Handoff
-        8. Create new part with previous_part field
-        9. Show success
+        3. Determine next part number (and the _pt1 name, if needed)
+        4. Collect metadata for new part
+        5. Confirm
+        6. Rewrite previous part once: add next_part, set status to
+           "Completed" if Active/Handoff, rename to _pt1 (if needed)
+        7. Create new part with previous_part field
+        8. Show success
     """
     try:
-        # Select session
-        session_path, parsed_info = select_session_to_continue(sessions_dir)
+        # Select session (its frontmatter comes back already parsed)
+        session_path, parsed_info, previous_metadata = select_session_to_continue(sessions_dir)
         
         if not session_path:
             print("\n❌ Cancelled by user")
             return 1
         
-        # Parse metadata from selected session
-        previous_metadata = parse_yaml_frontmatter(session_path)
-        
         if not previous_metadata:
             print(f"\n❌ Could not read metadata from {session_path.name}")
             return 1
@@ -1360,21 +1663,24 @@ def create_continuation_workflow(sessions_dir, dry_run=False):
         base_id = f"{parsed_info['date']}-{parsed_info['number']}"
         new_session_id = f"{base_id}_pt{next_part_num}"
         
-        # Rename original to _pt1 if needed
-        if not dry_run and not parsed_info['part']:
-            print(f"\n📝 Renaming {session_path.name} → {base_id}_pt1.md")
-            session_path = rename_to_part1(session_path, parsed_info)
-            print(f"✅ Renamed to: {session_path.name}")
-        elif dry_run and not parsed_info['part']:
-            print(f"\n🔍 DRY RUN: Would rename {session_path.name} → {base_id}_pt1.md")
-            # Update session_path for dry run consistency
-            session_path = session_path.parent / f"{base_id}_pt1.md"
+        # Original becomes _pt1 if needed; the rename happens together with
+        # the frontmatter update below, so cancelling leaves it untouched
+        try:
+            part1_path = get_part1_path(session_path, parsed_info)
+        except FileExistsError:
+            print(f"\n❌ Error: {base_id}_pt1.md already exists")
+            print(f"   {session_path.name} cannot be renamed to part 1 without overwriting it.")
+            print(f"\n💡 Rename or remove the existing {base_id}_pt1.md first.")
+            return 1
+        previous_path = part1_path or session_path
+        if dry_run and part1_path:
+            print(f"\n🔍 DRY RUN: Would rename {session_path.name} → {part1_path.name}")
         
         # Collect metadata for new part
         new_metadata = collect_continuation_metadata(new_session_id, previous_metadata)
         
         # Add continuation fields
-        new_metadata['previous_part'] = session_path.name
+        new_metadata['previous_part'] = previous_path.name
         
         # Extract topic from title
         topic = new_metadata['title'].replace(f"Session {new_session_id}: ", "")
@@ -1382,32 +1688,38 @@ def create_continuation_workflow(sessions_dir, dry_run=False):
         # Confirm
         if not confirm_metadata(new_metadata, new_session_id):
             print("\n❌ Cancelled by user")
-            # If we renamed in non-dry-run, we should rename back
-            # For simplicity, we'll note this as a limitation
             return 1
         
         # Dry run - skip file operations
         if dry_run:
             print("\n🔍 DRY RUN MODE")
-            print(f"Would update {session_path.name}:")
+            print(f"Would update {previous_path.name}:")
             print(f"  - Add next_part: {new_session_id}.md")
             print(f"  - Update status: Completed")
             print(f"\nWould create: sessions/current/{new_session_id}.md")
-            print(f"  - With previous_part: {session_path.name}")
+            print(f"  - With previous_part: {previous_path.name}")
             print("\nNo files were created or modified.")
             return 0
         
-        # Update previous part
-        # Add next_part field
-        update_yaml_field(session_path, 'next_part', f"{new_session_id}.md")
-        
-        # Update status if Active or Handoff
+        # Update previous part: add next_part field, close out its status
+        # if Active or Handoff, and rename it to _pt1, in a single rewrite
+        updates = {'next_part': f"{new_session_id}.md"}
         prev_status = previous_metadata.get('status', '')
-        if prev_status in ['Active', 'Handoff']:
-            update_yaml_field(session_path, 'status', 'Completed')
-            print(f"✅ Updated {session_path.name} status: {prev_status} → Completed")
+        if prev_status in ('Active', 'Handoff'):
+            updates['status'] = 'Completed'
+        
+        if part1_path:
+            print(f"\n📝 Renaming {session_path.name} → {part1_path.name}")
+        if not update_yaml_fields(session_path, updates, rename_to=part1_path):
+            print(f"\n❌ Failed to update {session_path.name}")
+            return 1
+        if part1_path:
+            print(f"✅ Renamed to: {part1_path.name}")
         
-        print(f"✅ Updated {session_path.name} with next_part field")
+        if 'status' in updates:
+            print(f"✅ Updated {previous_path.name} status: {prev_status} → Completed")
+        
+        print(f"✅ Updated {previous_path.name} with next_part field")
         
         # Create new part
         new_file_path = sessions_dir / f"{new_session_id}.md"
@@ -1416,7 +1728,7 @@ def create_continuation_workflow(sessions_dir, dry_run=False):
         
         if success:
             show_success(new_file_path)
-            print(f"🔗 Linked to previous part: {session_path.name}")
+            print(f"🔗 Linked to previous part: {previous_path.name}")
             return 0
         else:
             print(f"\n❌ Failed to create continuation file")
@@ -1436,15 +1748,39 @@ def create_continuation_workflow(sessions_dir, dry_run=False):
 # STEP 7: PRUNING FUNCTIONS
 # =============================================================================
 
-def initialize_pruning_paths():
-    """Initialize the path configuration for pruning."""
+def initialize_pruning_paths(sessions_dir: Optional[Path] = None):
+    """
+    Initialize the path configuration for pruning.
+
+    Args:
+        sessions_dir: sessions/current/ as already resolved by main(); looked up
+            again only when omitted.
+    """
     global SESSIONS_ROOT, CURRENT_DIR, RECENT_DIR, ARCHIVE_DIR
-    current = find_sessions_directory()
+    current = sessions_dir if sessions_dir is not None else find_sessions_directory()
     SESSIONS_ROOT = current.parent
     CURRENT_DIR = current
     RECENT_DIR = SESSIONS_ROOT / "recent"
     ARCHIVE_DIR = SESSIONS_ROOT / "archived"
 
+# Age thresholds: current/ -> recent/ after a week, recent/ cleanup after 90 days
+_SEVEN_DAYS = timedelta(days=7)
+_NINETY_DAYS = timedelta(days=90)
+
+def _scan_md(dir_path: Path) -> List[os.DirEntry]:
+    """
+    List the .md files in dir_path as DirEntry objects.
+
+    One directory read with no per-file stat or Path construction; callers
+    build a Path only for the entries they act on. The listing is taken up
+    front so callers can move or delete files while looping over it.
+    """
+    with os.scandir(dir_path) as it:
+        return [
+            entry for entry in it
+            if os.path.normcase(entry.name).endswith(".md") and entry.is_file()
+        ]
+
 def check_pruning_directories() -> bool:
     """Check if required directories exist for pruning."""
     log("Checking directory structure...")
@@ -1464,133 +1800,81 @@ def check_pruning_directories() -> bool:
     success("Directory structure verified")
     return True
 
+# Full maintenance parses the same names in several passes; datetimes are
+# immutable, so repeat lookups can share one result
+@lru_cache(maxsize=4096)
 def extract_session_date(filename: str) -> Optional[datetime]:
     """Extract date from filename (format: YYYYMMDD-NN.md)."""
-    match = re.match(r'^(\d{8})-(\d{2})\.md$', filename)
-    if match:
-        date_part = match.group(1)
-        year = int(date_part[:4])
-        month = int(date_part[4:6])
-        day = int(date_part[6:8])
-        try:
-            return datetime(year, month, day)
-        except ValueError:
-            return None
-    return None
-
-def get_session_status(file_path: Path) -> Optional[str]:
-    """Extract status from YAML frontmatter of session file."""
+    # Fixed-width name, so check the shape and slice instead of regex matching
+    if (len(filename) != 14 or filename[8] != '-' or not filename.endswith('.md')
+            or not filename[:8].isdecimal() or not filename[9:11].isdecimal()):
+        return None
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find YAML frontmatter between --- markers
-        yaml_match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if yaml_match:
-            yaml_content = yaml_match.group(1)
-            try:
-                # Parse YAML manually (no external dependencies)
-                metadata = {}
-                for line in yaml_content.split('\n'):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        # Remove quotes if present
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            value = value[1:-1]
-                        metadata[key] = value
-                return metadata.get('status')
-            except Exception as e:
-                warning(f"Failed to parse YAML in {file_path.name}: {e}")
-                return None
-        else:
-            warning(f"No YAML frontmatter found in {file_path.name}")
-            return None
-    except Exception as e:
-        warning(f"Failed to read {file_path.name}: {e}")
+        return datetime(int(filename[:4]), int(filename[4:6]), int(filename[6:8]))
+    except ValueError:
         return None
 
-def update_session_status(file_path: Path, new_status: str) -> bool:
-    """Update status in YAML frontmatter of session file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find YAML frontmatter between --- markers
-        yaml_match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if not yaml_match:
-            warning(f"No YAML frontmatter found in {file_path.name}")
-            return False
-        
-        yaml_content = yaml_match.group(1)
-        try:
-            # Parse YAML manually (no external dependencies)
-            metadata = {}
-            for line in yaml_content.split('\n'):
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    metadata[key] = value
-        except Exception as e:
-            warning(f"Failed to parse YAML in {file_path.name}: {e}")
-            return False
-        
-        # Update status
-        metadata['status'] = new_status
-        
-        # Reconstruct YAML frontmatter manually
-        new_yaml_lines = ['---']
-        for key, value in metadata.items():
-            if any(char in str(value) for char in [':', '#', '[', ']', '{', '}']) or ' ' in str(value):
-                new_yaml_lines.append(f'{key}: "{value}"')
-            else:
-                new_yaml_lines.append(f'{key}: {value}')
-        new_yaml_lines.append('---')
-        new_yaml = '\n'.join(new_yaml_lines)
-        
-        # Replace the YAML section in the content
-        new_content = re.sub(
-            r'^---\s*\n.*?\n---\s*\n',
-            f'{new_yaml}\n\n',
-            content,
-            flags=re.DOTALL,
-            count=1
-        )
-        
-        # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
-        return True
-    except Exception as e:
-        warning(f"Failed to update status in {file_path.name}: {e}")
-        return False
+# Statuses that pruning never rewrites
+_FINAL_STATUSES = ("Completed (Agent)", "Completed (Auto)")
+
+def _read_session_metadata(f, file_path: Path) -> Optional[dict]:
+    """
+    Parse the frontmatter from an open session file.
+
+    Only the frontmatter lines are read; f is left positioned at the body so
+    callers that rewrite the file can read the rest with f.read(). Returns
+    None (with a warning) when the file has no frontmatter.
+    """
+    block = _read_frontmatter_block(f)
+    if block is None:
+        warning(f"No YAML frontmatter found in {file_path.name}")
+        return None
+    
+    # Same simple key: value parser as the session creator (no PyYAML)
+    return _parse_frontmatter_lines(block)
+
+def _write_session_status(file_path: Path, metadata: dict, body: str, new_status: str) -> None:
+    """Rewrite a session file from its parsed frontmatter and body with a new status."""
+    # Update status
+    metadata['status'] = new_status
+    
+    # Reconstruct YAML frontmatter in the file's own key order, quoting the
+    # same way as session creation
+    new_yaml_lines = ['---']
+    new_yaml_lines.extend(_format_yaml_line(key, value) for key, value in metadata.items())
+    new_yaml_lines.append('---')
+    new_yaml = '\n'.join(new_yaml_lines)
+    
+    # New frontmatter, one blank line, then the original body
+    new_content = f'{new_yaml}\n\n' + _strip_leading_blank_lines(body)
+    
+    # Write back atomically; pruning rewrites many files per run
+    _atomic_write_text(file_path, new_content)
 
 def update_session_status_if_needed(file_path: Path, dry_run: bool = False) -> bool:
     """Update session status to appropriate 'Completed' variant if needed."""
-    current_status = get_session_status(file_path)
+    # One open per file: the frontmatter is always read, the body only when
+    # the file is actually going to be rewritten
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            metadata = _read_session_metadata(f, file_path)
+            current_status = metadata.get('status') if metadata is not None else None
+            needs_rewrite = (
+                not dry_run
+                and current_status is not None
+                and current_status not in _FINAL_STATUSES
+            )
+            body = f.read() if needs_rewrite else None
+    except Exception as e:
+        warning(f"Failed to read {file_path.name}: {e}")
+        current_status = None
     
     if current_status is None:
         warning(f"Could not determine status for {file_path.name}, skipping status update")
         return False
     
     # If already has a completed status, don't change it
-    if current_status in ["Completed (Agent)", "Completed (Auto)"]:
+    if current_status in _FINAL_STATUSES:
         return True
     
     # Determine appropriate status
@@ -1602,13 +1886,14 @@ def update_session_status_if_needed(file_path: Path, dry_run: bool = False) -> b
     if dry_run:
         log(f"DRY RUN: Would update status in {file_path.name} from '{current_status}' to '{new_status}'")
         return True
-    else:
-        if update_session_status(file_path, new_status):
-            log(f"Updated status in {file_path.name}: '{current_status}' -> '{new_status}'")
-            return True
-        else:
-            warning(f"Failed to update status in {file_path.name}")
-            return False
+    
+    try:
+        _write_session_status(file_path, metadata, body, new_status)
+    except Exception as e:
+        warning(f"Failed to update status in {file_path.name}: {e}")
+        return False
+    log(f"Updated status in {file_path.name}: '{current_status}' -> '{new_status}'")
+    return True
 
 def move_old_sessions(dry_run: bool = False) -> int:
     """Move sessions older than 7 days from current/ to recent/."""
@@ -1616,14 +1901,16 @@ def move_old_sessions(dry_run: bool = False) -> int:
     
     moved_count = 0
     current_date = datetime.now()
-    seven_days_ago = current_date - timedelta(days=7)
+    seven_days_ago = current_date - _SEVEN_DAYS
     
     # Find all .md files in current/ directory
-    for file_path in CURRENT_DIR.glob("*.md"):
-        filename = file_path.name
+    for entry in _scan_md(CURRENT_DIR):
+        filename = entry.name
         session_date = extract_session_date(filename)
         
         if session_date and session_date < seven_days_ago:
+            file_path = Path(entry.path)
+            
             # Update status before moving
             update_session_status_if_needed(file_path, dry_run)
             
@@ -1637,10 +1924,20 @@ def move_old_sessions(dry_run: bool = False) -> int:
                 target_file = RECENT_DIR / backup_name
             
             if dry_run:
-                log(f"DRY RUN: Would copy {filename} -> {target_file}")
-                log(f"DRY RUN: Would delete {filename} from current/ after validation")
+                log(f"DRY RUN: Would move {filename} -> {target_file}")
             else:
-                # Copy file first
+                # current/ and recent/ normally share a filesystem, where a
+                # rename moves the file atomically without copying it
+                try:
+                    os.rename(file_path, target_file)
+                except OSError:
+                    pass
+                else:
+                    log(f"Moved: {filename} -> recent/")
+                    moved_count += 1
+                    continue
+                
+                # Otherwise copy first (e.g. recent/ on another filesystem)
                 shutil.copy2(file_path, target_file)
                 log(f"Copied: {filename} -> recent/")
                 
@@ -1669,61 +1966,66 @@ def move_old_sessions(dry_run: bool = False) -> int:
 
 def copy_to_monthly_archives(dry_run: bool = False) -> None:
     """Copy all files from current/ and recent/ to archived/ in YYYY-MM.zip format."""
+    # Only this pruning step needs zipfile (and zlib behind it)
+    import zipfile
+    
     log("Copying all files to archived/ in monthly zip archives...")
     
-    # Get all unique year-month combinations from current/ and recent/ files
-    year_months = set()
+    # Bucket files from current/ and recent/ by year-month in a single pass
+    files_by_month = {}
     
     for source_dir in [CURRENT_DIR, RECENT_DIR]:
-        for file_path in source_dir.glob("*.md"):
-            session_date = extract_session_date(file_path.name)
+        for entry in _scan_md(source_dir):
+            session_date = extract_session_date(entry.name)
             if session_date:
-                year_month = session_date.replace(day=1)
-                year_months.add(year_month)
+                # Packed YYYYMM int: cheap to hash and sorts chronologically
+                year_month = session_date.year * 100 + session_date.month
+                files_by_month.setdefault(year_month, []).append(Path(entry.path))
     
-    if not year_months:
+    if not files_by_month:
         log("No sessions found to archive")
         return
     
-    # Sort year-months and process each month
-    sorted_year_months = sorted(year_months)
+    # Process each month in order
+    sorted_year_months = sorted(files_by_month)
     
     for target_year_month in sorted_year_months:
-        archive_zip_name = f"{target_year_month.strftime('%Y-%m')}.zip"
+        year, month = divmod(target_year_month, 100)
+        month_label = f"{year:04d}-{month:02d}"
+        archive_zip_name = f"{month_label}.zip"
         archive_zip_path = ARCHIVE_DIR / archive_zip_name
         
-        log(f"Processing {target_year_month.strftime('%Y-%m')}...")
+        log(f"Processing {month_label}...")
         
-        files_to_archive = []
+        files_to_archive = files_by_month[target_year_month]
         
-        # Collect files from current/ and recent/ for the target month
-        for source_dir in [CURRENT_DIR, RECENT_DIR]:
-            for file_path in source_dir.glob("*.md"):
-                session_date = extract_session_date(file_path.name)
-                if session_date and session_date.year == target_year_month.year and session_date.month == target_year_month.month:
-                    files_to_archive.append(file_path)
-        
-        if not files_to_archive:
-            log(f"No files found for month: {target_year_month.strftime('%Y-%m')}")
-            continue
+        # Per-file log lines are collected and written once per month
+        file_log = []
         
         if dry_run:
             log(f"DRY RUN: Would create {archive_zip_name} with {len(files_to_archive)} files")
             for file_path in files_to_archive:
-                log(f"DRY RUN: Would add {file_path.name} to {archive_zip_name}")
+                file_log.append(_format_log(f"DRY RUN: Would add {file_path.name} to {archive_zip_name}"))
+            sys.stdout.write("".join(file_log))
         else:
             try:
-                # Create or update zip archive
-                with zipfile.ZipFile(archive_zip_path, 'a', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in files_to_archive:
-                        # Check if file already exists in zip
-                        if file_path.name in zipf.namelist():
-                            log(f"File already exists in archive: {file_path.name}")
-                            continue
-                        
-                        # Add file to zip
-                        zipf.write(file_path, file_path.name)
-                        log(f"Added: {file_path.name} to {archive_zip_name}")
+                try:
+                    # Create or update zip archive
+                    with zipfile.ZipFile(archive_zip_path, 'a', zipfile.ZIP_DEFLATED) as zipf:
+                        # Names already in the zip, read once and kept current as files are added
+                        archived_names = set(zipf.namelist())
+                        for file_path in files_to_archive:
+                            # Check if file already exists in zip
+                            if file_path.name in archived_names:
+                                file_log.append(_format_log(f"File already exists in archive: {file_path.name}"))
+                                continue
+                            
+                            # Add file to zip
+                            zipf.write(file_path, file_path.name)
+                            archived_names.add(file_path.name)
+                            file_log.append(_format_log(f"Added: {file_path.name} to {archive_zip_name}"))
+                finally:
+                    sys.stdout.write("".join(file_log))
                 
                 success(f"Created/updated {archive_zip_name} with {len(files_to_archive)} files")
             except Exception as e:
@@ -1737,15 +2039,14 @@ def cleanup_old_sessions(dry_run: bool = False) -> None:
     log("Checking for sessions older than 90 days in recent/...")
     
     current_date = datetime.now()
-    ninety_days_ago = current_date - timedelta(days=90)
+    ninety_days_ago = current_date - _NINETY_DAYS
     
-    # Find files older than 90 days in recent/
+    # Find files older than 90 days in recent/ (Path built only for matches)
     old_files = []
-    
-    for file_path in RECENT_DIR.glob("*.md"):
-        session_date = extract_session_date(file_path.name)
+    for entry in _scan_md(RECENT_DIR):
+        session_date = extract_session_date(entry.name)
         if session_date and session_date < ninety_days_ago:
-            old_files.append((file_path, session_date))
+            old_files.append((Path(entry.path), session_date))
     
     if not old_files:
         log("No sessions older than 90 days found in recent/")
@@ -1763,13 +2064,15 @@ def cleanup_old_sessions(dry_run: bool = False) -> None:
         return
     
     # Ask user for confirmation
-    print(f"\n{Colors.YELLOW}WARNING:{Colors.NC} Found {len(old_files)} sessions older than 90 days in recent/")
-    print("These files have been copied to archived/ folders. Do you want to delete them from recent/?")
-    print("This will free up space but remove them from the recent/ directory.")
+    _emit([
+        f"\n{_WARNING_PREFIX}Found {len(old_files)} sessions older than 90 days in recent/",
+        "These files have been copied to archived/ folders. Do you want to delete them from recent/?",
+        "This will free up space but remove them from the recent/ directory.",
+    ])
     
     response = input("Delete old sessions from recent/? (y/N): ").strip().lower()
     
-    if response in ['y', 'yes']:
+    if response in _YES_ANSWERS:
         deleted_count = 0
         for file_path, session_date in old_files:
             try:
@@ -1784,26 +2087,29 @@ def cleanup_old_sessions(dry_run: bool = False) -> None:
     else:
         log("User chose not to delete old sessions from recent/")
 
+_PRUNING_MENU = "\n".join([
+    _SEP_DASH,
+    "  SESSION PRUNING",
+    _SEP_DASH,
+    "",
+    "What would you like to do?",
+    "",
+    "1. Move old sessions (7+ days)",
+    "2. Create monthly archives",
+    "3. Cleanup old sessions (90+ days)",
+    "4. Full maintenance (all steps)",
+    "5. Cancel",
+    "",
+]) + "\n"
+
 def show_pruning_menu():
     """Display menu for pruning options."""
-    print("-" * 64)
-    print("  SESSION PRUNING")
-    print("-" * 64)
-    print()
-    print("What would you like to do?")
-    print()
-    print("1. Move old sessions (7+ days)")
-    print("2. Create monthly archives")
-    print("3. Cleanup old sessions (90+ days)")
-    print("4. Full maintenance (all steps)")
-    print("5. Cancel")
-    print()
+    sys.stdout.write(_PRUNING_MENU)
     
-    while True:
-        choice = input("Choice [1-5]: ").strip()
-        if choice in ['1', '2', '3', '4', '5']:
-            return int(choice)
-        print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
+    return _prompt_menu_choice(
+        "Choice [1-5]: ", _PRUNING_CHOICES,
+        "Invalid choice. Please enter 1, 2, 3, 4, or 5."
+    )
 
 def prune_sessions_workflow(sessions_dir, dry_run=False):
     """
@@ -1818,7 +2124,7 @@ def prune_sessions_workflow(sessions_dir, dry_run=False):
     """
     try:
         # Initialize pruning paths
-        initialize_pruning_paths()
+        initialize_pruning_paths(sessions_dir)
         
         if not check_pruning_directories():
             return 1
@@ -1892,6 +2198,8 @@ def run_session_log_ingest(
     if not ingest_script.exists():
         error(f"Ingest script not found: {ingest_script}")
         return 1
+    import subprocess  # only the ingest path spawns a child process
+
     args = [sys.executable, str(ingest_script)]
     if no_archives:
         args.append("--no-archives")
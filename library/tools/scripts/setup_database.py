@@ -44,6 +44,9 @@ TEMPLATE_REF = "library/templates/mcp.json.example"
 # Server entry this script owns; other mcpServers keys are preserved on write.
 MANAGED_MCP_SERVER_KEY = "Resonance7-sqlite"
 
+# Platform never changes within a run; checked once at import.
+_IS_WINDOWS = os.name == "nt"
+
 
 def _err(msg: str) -> None:
     print(f"ERROR: {msg}", file=sys.stderr)
@@ -168,7 +171,7 @@ def resolve_node_exe(
         else:
             raise SystemExit(f"NODE_EXE is set but is not a file: {p}")
 
-    if not candidates and os.name == "nt":
+    if not candidates and _IS_WINDOWS:
         candidates.extend(_windows_program_files_nodes())
 
     if not candidates:
@@ -181,7 +184,7 @@ def resolve_node_exe(
         raise SystemExit(1)
 
     chosen = candidates[0]
-    if len(candidates) > 1 and os.name == "nt" and not arg_node and not env:
+    if len(candidates) > 1 and _IS_WINDOWS and not arg_node and not env:
         wpf = [c for c in candidates if "Program Files" in str(c) and "nodejs" in str(c).lower()]
         if wpf:
             chosen = wpf[0]
@@ -206,7 +209,7 @@ def resolve_node_exe(
 def resolve_npm_path(node: Path) -> Path:
     """Use npm that ships next to the chosen node when possible."""
     d = node.parent
-    if os.name == "nt":
+    if _IS_WINDOWS:
         for name in ("npm.cmd", "npm.exe"):
             p = d / name
             if p.is_file():
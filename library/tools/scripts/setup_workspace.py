@@ -20,9 +20,8 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import re
-import shutil
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -49,9 +48,28 @@ RUNTIME_DIRECTORIES: tuple[str, ...] = (
     "tests",
 )
 
+# Banner rules and the static --interactive menu, each emitted with one write.
+_RULE_WIDE = "=" * 64
+_RULE_NARROW = "-" * 48
+_MENU_TEXT = (
+    f"\n{_RULE_NARROW}\n  WORKSPACE SETUP\n{_RULE_NARROW}\n"
+    "1. Bootstrap runtime directories\n"
+    "2. Pair external project (.code-workspace)\n"
+    "3. Show workspace status\n"
+    "4. Exit\n"
+)
+
+# Valid answers to the --interactive menu prompt.
+_MENU_CHOICES = frozenset({"1", "2", "3", "4"})
+
+# Answers that confirm the pairing overwrite prompt (input is lowercased first).
+_YES_ANSWERS = frozenset({"y", "yes"})
+
 # Safe workspace file names: letters, digits, hyphen, underscore.
 _PAIR_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
 
+# Presence of this file identifies the foundation repo root.
+FOUNDATION_MARKER_REL = "library/agent_foundation.json"
 # Tracked in Git; removed locally after first successful bootstrap (do not commit deletion).
 SETUP_SENTINEL_REL = "library/.workspace_setup_required"
 WORKSPACE_MCP_TEMPLATE_REL = "library/templates/workspace_mcp_servers.md"
@@ -91,15 +109,19 @@ def find_workspace_root(explicit: Path | None = None) -> Path:
     """
     Resolve the Resonance7 foundation repo root.
 
-    Default: infer from this file's location (library/tools/scripts/ -> root).
-    Explicit --workspace must contain library/agent_foundation.json.
+    Default: R7_WORKSPACE_ROOT if set, else infer from this file's location
+    (library/tools/scripts/ -> root). Explicit --workspace or R7_WORKSPACE_ROOT
+    must contain library/agent_foundation.json.
     """
+    env_root = os.environ.get("R7_WORKSPACE_ROOT")
     if explicit is not None:
         root = explicit.resolve()
+    elif env_root:
+        root = Path(env_root).resolve()
     else:
         root = Path(__file__).resolve().parents[3]
 
-    marker = root / "library" / "agent_foundation.json"
+    marker = root / FOUNDATION_MARKER_REL
     if not marker.is_file():
         _err(f"Not a Resonance7 workspace (missing {marker})")
         raise SystemExit(1)
@@ -116,16 +138,22 @@ def bootstrap_directories(root: Path, dry_run: bool = False) -> BootstrapResult:
     Never deletes or modifies existing paths; mkdir parents as needed.
     """
     result = BootstrapResult()
+    root_str = os.fspath(root)  # join as strings; no Path object per entry
 
     for rel in RUNTIME_DIRECTORIES:
-        target = root / rel
-        if target.exists():
-            result.existing.append(rel)
-            continue
+        target = os.path.join(root_str, rel)
         if dry_run:
-            result.created.append(rel)
+            if os.path.exists(target):
+                result.existing.append(rel)
+            else:
+                result.created.append(rel)
+            continue
+        # Attempt mkdir directly: one syscall for existing dirs instead of stat + mkdir.
+        try:
+            os.makedirs(target)
+        except FileExistsError:
+            result.existing.append(rel)
             continue
-        target.mkdir(parents=True, exist_ok=True)
         result.created.append(rel)
 
     return result
@@ -147,6 +175,8 @@ def install_workspace_mcp_reference(root: Path, dry_run: bool = False) -> bool:
     if dry_run:
         _info(f"Would install: {WORKSPACE_MCP_TEMPLATE_REL} -> {WORKSPACE_MCP_LOCAL_REL}")
         return True
+    import shutil  # only needed on first install; keeps default startup lean
+
     dest.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy2(template, dest)
     _info(f"Installed local MCP reference: {WORKSPACE_MCP_LOCAL_REL}")
@@ -156,17 +186,15 @@ def install_workspace_mcp_reference(root: Path, dry_run: bool = False) -> bool:
 def print_bootstrap_summary(root: Path, result: BootstrapResult, dry_run: bool) -> None:
     """Human-readable bootstrap report."""
     prefix = "Would create" if dry_run else "Created"
-    _info(f"Workspace: {root}")
-    if result.created:
-        for rel in result.created:
-            _info(f"  {prefix}: {rel}")
-    if result.existing:
-        for rel in result.existing:
-            _info(f"  Exists:  {rel}")
-    _info(
+    lines = [f"Workspace: {root}"]
+    lines.extend(f"  {prefix}: {rel}" for rel in result.created)
+    lines.extend(f"  Exists:  {rel}" for rel in result.existing)
+    lines.append(
         f"Done. {len(result.created)} {'would be ' if dry_run else ''}created, "
         f"{len(result.existing)} already present."
     )
+    # One write for the whole report; per-line prints are slow on Windows consoles
+    _info("\n".join(lines))
 
 
 # ---------------------------------------------------------------------------
@@ -185,12 +213,19 @@ def clear_setup_sentinel(root: Path, dry_run: bool = False) -> bool:
     Upstream keeps it tracked so the next clone still gets the marker.
     """
     path = setup_sentinel_path(root)
-    if not path.is_file():
-        return False
     if dry_run:
+        if not path.is_file():
+            return False
         _info(f"Would remove first-run marker: {path}")
         return True
-    path.unlink()
+    try:
+        path.unlink()
+    except (FileNotFoundError, IsADirectoryError):
+        # No marker file to clear (a directory at that path is left alone)
+        return False
+    except OSError as e:
+        _warn(f"Could not remove first-run marker {path}: {e}")
+        return False
     _info(f"Removed first-run marker: {path}")
     return True
 
@@ -244,6 +279,13 @@ def workspace_file_path(root: Path, name: str) -> Path:
     return root / "projects" / f"{name}.code-workspace"
 
 
+def _refuse_overwrite(out_path: Path) -> None:
+    """Report an existing pairing file and exit (overwrite requires --force)."""
+    _err(f"Workspace file already exists: {out_path}")
+    _err("Use --force to overwrite, or pick a different name.")
+    raise SystemExit(1)
+
+
 def write_code_workspace(
     root: Path,
     name: str,
@@ -260,29 +302,36 @@ def write_code_workspace(
     name = validate_pair_name(name)
     project_path = resolve_project_path(str(project_path))
 
-    # Bootstrap ensures projects/ exists before we write into it.
-    bootstrap_directories(root, dry_run=dry_run)
+    # Bootstrap ensures projects/ exists before we write into it. A preview
+    # writes nothing and never reports the bootstrap result, so skip its probes.
+    if not dry_run:
+        bootstrap_directories(root)
     install_workspace_mcp_reference(root, dry_run=dry_run)
 
-    out_path = workspace_file_path(root, name)
-    if out_path.exists() and not force:
-        _err(f"Workspace file already exists: {out_path}")
-        _err("Use --force to overwrite, or pick a different name.")
-        raise SystemExit(1)
+    import json  # only pairing serializes; bootstrap/--show never need it
 
+    out_path = workspace_file_path(root, name)
     cfg = build_code_workspace(root, name, project_path)
 
     if dry_run:
-        _info(f"Would write: {out_path}")
-        _info(json.dumps(cfg, indent=2))
+        if os.path.lexists(out_path) and not force:
+            _refuse_overwrite(out_path)
+        _info(f"Would write: {out_path}\n{json.dumps(cfg, indent=2)}")
         return out_path
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(cfg, indent=2) + "\n", encoding="utf-8")
-    _info(f"Wrote {out_path}")
-    _info(f"  Resonance7 root: {root}")
-    _info(f"  Project folder:  {project_path}")
-    _info("Open this .code-workspace file in Cursor or VS Code for a multi-root workspace.")
+    # projects/ was created by bootstrap_directories() above; no extra mkdir.
+    # Exclusive create without --force: the open itself rejects an existing file.
+    try:
+        with out_path.open("w" if force else "x", encoding="utf-8") as fh:
+            fh.write(json.dumps(cfg, indent=2) + "\n")
+    except FileExistsError:
+        _refuse_overwrite(out_path)
+    _info(
+        f"Wrote {out_path}\n"
+        f"  Resonance7 root: {root}\n"
+        f"  Project folder:  {project_path}\n"
+        "Open this .code-workspace file in Cursor or VS Code for a multi-root workspace."
+    )
     # Pairing runs bootstrap first; clear first-run marker when not previewing.
     clear_setup_sentinel(root, dry_run=dry_run)
     return out_path
@@ -306,9 +355,7 @@ def pair_project_workflow(
         if not interactive:
             _err("Both --pair and --project-path are required (or use --interactive).")
             return 1
-        _info("")
-        _info("Pair external project with Resonance7 foundation")
-        _info("-" * 48)
+        _info(f"\nPair external project with Resonance7 foundation\n{_RULE_NARROW}")
         if not name:
             name = input("Workspace name (e.g. my-app): ").strip()
         if not project_path:
@@ -317,9 +364,10 @@ def pair_project_workflow(
             _err("Name and project path are required.")
             return 1
         out_path = workspace_file_path(root, validate_pair_name(name))
-        if out_path.exists() and not force:
+        # lexists: a dangling symlink also blocks the exclusive create later
+        if os.path.lexists(out_path) and not force:
             answer = input(f"{out_path} exists. Overwrite? [y/N]: ").strip().lower()
-            if answer not in ("y", "yes"):
+            if answer not in _YES_ANSWERS:
                 _info("Cancelled.")
                 return 1
             force = True
@@ -334,37 +382,38 @@ def pair_project_workflow(
 # ---------------------------------------------------------------------------
 def show_workspace_status(root: Path) -> None:
     """Print foundation paths and any pairing files under projects/."""
-    _info("=" * 64)
-    _info("  WORKSPACE STATUS")
-    _info("=" * 64)
-    _info(f"Foundation root: {root}")
-    _info("")
+    # Collected and emitted with a single write at the end.
+    lines = [_RULE_WIDE, "  WORKSPACE STATUS", _RULE_WIDE, f"Foundation root: {root}", ""]
 
-    _info("Runtime directories:")
+    lines.append("Runtime directories:")
+    root_str = os.fspath(root)
     for rel in RUNTIME_DIRECTORIES:
-        target = root / rel
-        mark = "ok" if target.is_dir() else "missing"
-        _info(f"  [{mark}] {rel}")
-    _info("")
+        mark = "ok" if os.path.isdir(os.path.join(root_str, rel)) else "missing"
+        lines.append(f"  [{mark}] {rel}")
+    lines.append("")
 
     sentinel = setup_sentinel_path(root)
     if sentinel.is_file():
-        _info("First-run marker: present (run bootstrap to remove)")
+        lines.append("First-run marker: present (run bootstrap to remove)")
     else:
-        _info("First-run marker: absent (bootstrap completed on this clone)")
-    _info("")
-
-    projects_dir = root / "projects"
-    if projects_dir.is_dir():
-        files = sorted(projects_dir.glob("*.code-workspace"))
-        if files:
-            _info("Pairing files (projects/):")
-            for f in files:
-                _info(f"  {f.name}")
-        else:
-            _info("Pairing files: (none yet)")
+        lines.append("First-run marker: absent (bootstrap completed on this clone)")
+    lines.append("")
+
+    # One directory read; a missing projects/ surfaces as an exception instead
+    # of a separate is_dir() probe.
+    try:
+        with os.scandir(root / "projects") as it:
+            names = sorted(e.name for e in it if e.name.endswith(".code-workspace"))
+    except (FileNotFoundError, NotADirectoryError):
+        lines.append("Pairing files: projects/ not created yet")
     else:
-        _info("Pairing files: projects/ not created yet")
+        if names:
+            lines.append("Pairing files (projects/):")
+            lines.extend(f"  {name}" for name in names)
+        else:
+            lines.append("Pairing files: (none yet)")
+
+    _info("\n".join(lines))
 
 
 # ---------------------------------------------------------------------------
@@ -372,42 +421,52 @@ def show_workspace_status(root: Path) -> None:
 # ---------------------------------------------------------------------------
 def show_menu() -> int:
     """Simple numbered menu; returns 1-4 or raises SystemExit on bad input."""
-    _info("")
-    _info("-" * 48)
-    _info("  WORKSPACE SETUP")
-    _info("-" * 48)
-    _info("1. Bootstrap runtime directories")
-    _info("2. Pair external project (.code-workspace)")
-    _info("3. Show workspace status")
-    _info("4. Exit")
-    _info("")
+    _info(_MENU_TEXT)
     while True:
         choice = input("Choice [1-4]: ").strip()
-        if choice in ("1", "2", "3", "4"):
+        if choice in _MENU_CHOICES:
             return int(choice)
         _info("Invalid choice. Enter 1, 2, 3, or 4.")
 
 
+# Menu actions return an exit code to leave the loop, or None to show the menu again.
+def _menu_bootstrap(root: Path, dry_run: bool) -> int | None:
+    result = bootstrap_directories(root, dry_run=dry_run)
+    print_bootstrap_summary(root, result, dry_run)
+    install_workspace_mcp_reference(root, dry_run=dry_run)
+    clear_setup_sentinel(root, dry_run=dry_run)
+    return None
+
+
+def _menu_pair(root: Path, dry_run: bool) -> int | None:
+    code = pair_project_workflow(root, None, None, dry_run=dry_run, interactive=True)
+    return code if code != 0 else None
+
+
+def _menu_status(root: Path, dry_run: bool) -> int | None:
+    show_workspace_status(root)
+    return None
+
+
+def _menu_exit(root: Path, dry_run: bool) -> int | None:
+    _info("Goodbye.")
+    return 0
+
+
+_MENU_ACTIONS = {
+    1: _menu_bootstrap,
+    2: _menu_pair,
+    3: _menu_status,
+    4: _menu_exit,
+}
+
+
 def run_interactive_menu(root: Path, dry_run: bool) -> int:
     """Loop until user exits; each action is idempotent where applicable."""
     while True:
-        choice = show_menu()
-        if choice == 1:
-            result = bootstrap_directories(root, dry_run=dry_run)
-            print_bootstrap_summary(root, result, dry_run)
-            install_workspace_mcp_reference(root, dry_run=dry_run)
-            clear_setup_sentinel(root, dry_run=dry_run)
-        elif choice == 2:
-            code = pair_project_workflow(
-                root, None, None, dry_run=dry_run, interactive=True
-            )
-            if code != 0:
-                return code
-        elif choice == 3:
-            show_workspace_status(root)
-        elif choice == 4:
-            _info("Goodbye.")
-            return 0
+        code = _MENU_ACTIONS[show_menu()](root, dry_run)
+        if code is not None:
+            return code
 
 
 # ---------------------------------------------------------------------------
@@ -442,7 +501,8 @@ Examples:
         "--workspace",
         type=str,
         default=None,
-        help="Resonance7 root (contains library/). Default: infer from script location.",
+        help="Resonance7 root (contains library/). Default: $R7_WORKSPACE_ROOT, "
+        "else infer from script location.",
     )
     parser.add_argument(
         "--dry-run",